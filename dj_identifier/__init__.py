@@ -1,11 +1,13 @@
 """Lightweight DJ set segmentation and identification utilities."""
 
-from .types import SegmentFingerprint, TrackMatch, TrackSegment
-from .pipeline import run_pipeline
+from .types import SegmentBatch, SegmentFingerprint, TrackMatch, TrackSegment
+from .pipeline import run_pipeline, run_pipeline_array
 
 __all__ = [
+    "SegmentBatch",
     "SegmentFingerprint",
     "TrackMatch",
     "TrackSegment",
     "run_pipeline",
+    "run_pipeline_array",
 ]
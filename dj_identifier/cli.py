@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -59,12 +60,13 @@ def main(argv: List[str] | None = None) -> None:
         max_segments=args.max_segments,
         min_segment_duration=args.min_segment_duration,
     )
-    matches = run_pipeline(args.audio, store, max_segments=args.max_segments)
-    for match in matches:
-        print(
-            f"{match.segment.start:7.2f}-{match.segment.end:7.2f} "
-            f"| {match.title} — {match.artist} (score={match.confidence:.2f})"
-        )
+    lines = [
+        f"{match.segment.start:7.2f}-{match.segment.end:7.2f} "
+        f"| {match.title} — {match.artist} (score={match.confidence:.2f})"
+        for match in matches
+    ]
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,77 +1,299 @@
-"""Fingerprint audio slices using chroma features and hashing."""
+"""Fingerprint audio slices using chroma features and packed bit signatures."""
 from __future__ import annotations
 
-import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
 from typing import Dict, Iterable, List, Sequence
 
 import numpy as np
 
-from .types import SegmentFingerprint, TrackSegment
+from .types import SegmentBatch, SegmentFingerprint, TrackSegment
 
+logger = logging.getLogger(__name__)
 
-def chroma_fingerprint(y: np.ndarray, sr: int) -> str:
-    """Create a compact, deterministic fingerprint string from chroma features."""
+_librosa = None
 
-    import librosa
 
-    chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-    normalized = chroma / np.maximum(np.linalg.norm(chroma, axis=0, keepdims=True), 1e-6)
-    pooled = normalized.mean(axis=1)
-    quantized = np.clip((pooled * 100).astype(int), -128, 127)
-    digest = hashlib.sha1(quantized.tobytes()).hexdigest()
-    return digest
+def _get_librosa():
+    """Resolve librosa once per process, keeping its import cost off cold start."""
+
+    global _librosa
+    if _librosa is None:
+        import librosa
+
+        _librosa = librosa
+    return _librosa
+
+
+SIGNATURE_BITS = 256
+SIGNATURE_BYTES = SIGNATURE_BITS // 8
+SIGNATURE_WORDS = SIGNATURE_BITS // 64
+
+# Fixed sign-random-projection matrix: one hyperplane per signature bit.
+# The seed is part of the on-disk format -- stored signatures and queries
+# must share the same projection to be comparable.
+_PROJECTION = np.random.default_rng(0).standard_normal((12, SIGNATURE_BITS)).astype(np.float32)
+
+
+def _signature_bits(chroma: np.ndarray) -> np.ndarray:
+    """Pack a 12xF chroma matrix into a 256-bit signature as ``uint64[4]``.
+
+    The mean chroma vector is projected onto 256 fixed random hyperplanes
+    and each bit stores the sign of one projection, so the Hamming distance
+    between signatures approximates the cosine distance of the underlying
+    chroma means and near-identical audio produces near-identical bits.
+    """
+
+    if chroma.shape[1] == 0:
+        return np.zeros(SIGNATURE_WORDS, dtype=np.uint64)
+    pooled = chroma.mean(axis=1, dtype=np.float32)
+    projected = pooled @ _PROJECTION
+    return np.packbits(projected > 0).view(np.uint64).copy()
+
+
+def bits_to_hex(bits: np.ndarray) -> str:
+    """Serialize a signature to a hex string for JSON storage."""
+
+    return bits.astype("<u8").tobytes().hex()
+
+
+def hex_to_bits(value: str) -> np.ndarray:
+    """Deserialize a hex string back into a ``uint64`` signature array."""
+
+    raw = bytes.fromhex(value)[:SIGNATURE_BYTES].ljust(SIGNATURE_BYTES, b"\0")
+    return np.frombuffer(raw, dtype="<u8").astype(np.uint64)
+
+
+def _chroma_f32(librosa, y: np.ndarray, sr: int, hop_length: int) -> np.ndarray:
+    """Compute chroma from an explicit complex64 STFT.
+
+    Running the STFT at complex64 and handing chroma_stft the precomputed
+    power spectrogram keeps every intermediate in float32, halving memory
+    traffic versus the implicit float64 upcasts librosa applies otherwise.
+    """
+
+    spectrum = librosa.stft(y, n_fft=1024, hop_length=hop_length, dtype=np.complex64)
+    power = np.abs(spectrum) ** 2
+    return librosa.feature.chroma_stft(S=power, sr=sr, n_fft=1024)
+
+
+def chroma_fingerprint(y: np.ndarray, sr: int) -> np.ndarray:
+    """Create a compact, near-duplicate tolerant bit signature from chroma features."""
+
+    librosa = _get_librosa()
+    chroma = _chroma_f32(librosa, y, sr, hop_length=512)
+    inv_norm = 1.0 / np.sqrt(np.einsum("ij,ij->j", chroma, chroma) + 1e-12)
+    normalized = chroma * inv_norm
+    return _signature_bits(normalized)
+
+
+def chroma_fingerprint_batch(
+    y: np.ndarray,
+    sr: int,
+    segments: Sequence[TrackSegment],
+    hop_length: int = 512,
+) -> List[np.ndarray]:
+    """Fingerprint many segments from a single chroma pass over the full signal.
+
+    Segments are contiguous slices of the same ``y``, so one STFT covers them
+    all; each segment then pools its own frame range of the shared chroma
+    matrix instead of re-windowing and re-transforming its samples.
+    """
+
+    if not segments:
+        return []
+
+    librosa = _get_librosa()
+
+    chroma = _chroma_f32(librosa, y, sr, hop_length=hop_length)
+    inv_norm = 1.0 / np.sqrt(np.einsum("ij,ij->j", chroma, chroma) + 1e-12)
+    normalized = chroma * inv_norm
+
+    starts, ends = SegmentBatch.from_segments(list(segments)).sample_bounds(sr)
+    f0 = starts // hop_length
+    f1 = np.maximum(ends // hop_length, f0 + 1)
+    return [_signature_bits(normalized[:, lo:hi]) for lo, hi in zip(f0, f1)]
 
 
 def fingerprint_segments(
     y: np.ndarray,
     sr: int,
     segments: Sequence[TrackSegment],
-    fingerprint_fn=chroma_fingerprint,
+    fingerprint_fn=None,
     min_samples: int = 2048,
+    hop_length: int = 512,
+    parallel: bool = False,
 ) -> List[SegmentFingerprint]:
-    """Fingerprint each segment individually."""
-
-    fingerprints: List[SegmentFingerprint] = []
-    for segment in segments:
-        start = int(segment.start * sr)
-        end = int(segment.end * sr)
-        slice_ = y[start:end]
-        if len(slice_) < min_samples:
-            continue
-        digest = fingerprint_fn(slice_, sr)
-        digest = fingerprint_fn(y[start:end], sr)
-        fingerprints.append(SegmentFingerprint(segment=segment, hash=digest))
-    return fingerprints
+    """Fingerprint each segment, sharing one chroma pass when possible.
+
+    A custom ``fingerprint_fn`` falls back to per-segment slicing; the default
+    path batches all segments through :func:`chroma_fingerprint_batch`. With
+    ``parallel=True`` the per-segment path ships slices to a process pool
+    (fingerprint_fn must be picklable); small jobs should stay serial to
+    avoid paying fork overhead.
+    """
+
+    segments = list(segments)
+    starts, ends = SegmentBatch.from_segments(segments).sample_bounds(sr)
+    keep = (ends - starts) >= min_samples
+    kept = [segment for segment, flag in zip(segments, keep) if flag]
+
+    logger.debug("fingerprinting %d segments (%d skipped as too short)", len(kept), len(segments) - len(kept))
+
+    if fingerprint_fn is None:
+        signatures = chroma_fingerprint_batch(y, sr, kept, hop_length=hop_length)
+        return [
+            SegmentFingerprint(segment=segment, bits=bits)
+            for segment, bits in zip(kept, signatures)
+        ]
+
+    slices = [y[lo:hi] for lo, hi, flag in zip(starts, ends, keep) if flag]
+    if parallel and len(slices) > 1:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            signatures = list(executor.map(fingerprint_fn, slices, repeat(sr)))
+    else:
+        signatures = [fingerprint_fn(slice_, sr) for slice_ in slices]
+    return [
+        SegmentFingerprint(segment=segment, bits=bits)
+        for segment, bits in zip(kept, signatures)
+    ]
 
 
 FingerprintDB = Dict[str, Dict[str, str]]
 
 
 def jaccard(a: Iterable[str], b: Iterable[str]) -> float:
-    set_a = set(a)
-    set_b = set(b)
+    """Set-based Jaccard kept for callers still comparing string hashes.
+
+    Arguments that are already sets are used as-is, and the common
+    single-element query reduces to one membership test instead of two
+    set constructions and two set operations.
+    """
+
+    set_a = a if isinstance(a, (set, frozenset)) else set(a)
+    set_b = b if isinstance(b, (set, frozenset)) else set(b)
+    if len(set_a) == 1:
+        element = next(iter(set_a))
+        return 1.0 / len(set_b) if element in set_b else 0.0
     if not set_a and not set_b:
         return 0.0
     return len(set_a & set_b) / len(set_a | set_b)
 
 
+def jaccard_bits(a: np.ndarray, b: np.ndarray) -> float:
+    """Popcount-based Tanimoto similarity between two bit signatures."""
+
+    inter = int(np.bitwise_count(a & b).sum())
+    union = int(np.bitwise_count(a | b).sum())
+    return inter / union if union else 0.0
+
+
+# Band-LSH parameters: 16 bands of 16 bits each cover the 256-bit signature.
+_BAND_BITS = 16
+_N_BANDS = SIGNATURE_BITS // _BAND_BITS
+
+
+@dataclass
+class SignatureIndex:
+    """Stacked database signatures plus the lookup structures built over them.
+
+    ``matrix`` holds one packed signature per row; ``row_tracks`` maps rows
+    back to track ids; ``popcounts`` caches each row's set-bit count so only
+    the XOR popcount runs per query; ``exact`` resolves byte-identical
+    signatures in O(1); ``bands`` is a band-LSH index (16 bands of 16 bits)
+    used to prefilter candidate rows before exact Jaccard scoring.
+    """
+
+    matrix: np.ndarray
+    row_tracks: List[str]
+    popcounts: np.ndarray
+    exact: Dict[bytes, int]
+    bands: List[Dict[int, List[int]]]
+
+
+def _index_from_matrix(matrix: np.ndarray, row_tracks: List[str]) -> SignatureIndex:
+    """Build the popcount, exact and band-LSH indexes over a signature matrix."""
+
+    exact: Dict[bytes, int] = {}
+    bands: List[Dict[int, List[int]]] = [{} for _ in range(_N_BANDS)]
+    popcounts = np.zeros(len(matrix), dtype=np.int64)
+    if len(matrix):
+        contiguous = np.ascontiguousarray(matrix)
+        popcounts = np.bitwise_count(contiguous).sum(axis=1).astype(np.int64)
+        raw = contiguous.astype("<u8").tobytes()
+        band_keys = contiguous.view(np.uint16)
+        for row in range(len(row_tracks)):
+            if popcounts[row]:
+                exact.setdefault(raw[row * SIGNATURE_BYTES : (row + 1) * SIGNATURE_BYTES], row)
+            for band in range(_N_BANDS):
+                bands[band].setdefault(int(band_keys[row, band]), []).append(row)
+    return SignatureIndex(
+        matrix=matrix, row_tracks=row_tracks, popcounts=popcounts, exact=exact, bands=bands
+    )
+
+
+def build_signature_matrix(database: FingerprintDB) -> SignatureIndex:
+    """Stack every stored signature into a ``(rows, SIGNATURE_WORDS)`` matrix
+    and build the lookup indexes over it."""
+
+    rows: List[np.ndarray] = []
+    row_tracks: List[str] = []
+    for track_id, entry in database.items():
+        for value in entry.get("hashes", []):
+            rows.append(hex_to_bits(value))
+            row_tracks.append(track_id)
+    matrix = np.vstack(rows) if rows else np.zeros((0, SIGNATURE_WORDS), dtype=np.uint64)
+    return _index_from_matrix(matrix, row_tracks)
+
+
 def match_fingerprints(
     fingerprints: Sequence[SegmentFingerprint],
-    database: FingerprintDB,
+    database: FingerprintDB | None = None,
     min_score: float = 0.1,
+    signatures: SignatureIndex | None = None,
 ) -> List[tuple[SegmentFingerprint, str, float]]:
-    """Return (fingerprint, track_id, score) matches ordered by segment order."""
+    """Return (fingerprint, track_id, score) matches ordered by segment order.
+
+    Exact signature hits resolve through a dict lookup. Other queries are
+    band-LSH prefiltered: only rows colliding with the query in at least one
+    16-bit band are scored, using the popcount Jaccard decomposition
+    ``((pa + pb - px) / 2) / ((pa + pb + px) / 2)``.
+    """
+
+    index = signatures if signatures is not None else build_signature_matrix(database or {})
+    matrix, row_tracks = index.matrix, index.row_tracks
+    if not len(matrix):
+        return []
+
+    logger.debug("matching %d fingerprints against %d signatures", len(fingerprints), len(matrix))
+
+    pa = index.popcounts
 
     results: List[tuple[SegmentFingerprint, str, float]] = []
     for fp in fingerprints:
-        best_track = None
-        best_score = 0.0
-        for track_id, entry in database.items():
-            db_hashes = entry.get("hashes", [])
-            score = jaccard([fp.hash], db_hashes)
-            if score > best_score:
-                best_score = score
-                best_track = track_id
-        if best_track is not None and best_score >= min_score:
-            results.append((fp, best_track, best_score))
+        exact_row = index.exact.get(fp.bits.astype("<u8").tobytes())
+        if exact_row is not None:
+            results.append((fp, row_tracks[exact_row], 1.0))
+            continue
+
+        band_keys = np.ascontiguousarray(fp.bits).view(np.uint16)
+        candidates: set[int] = set()
+        for band in range(_N_BANDS):
+            candidates.update(index.bands[band].get(int(band_keys[band]), ()))
+        if not candidates:
+            continue
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+
+        pb = int(np.bitwise_count(fp.bits).sum())
+        px = np.bitwise_count(matrix[rows] ^ fp.bits).sum(axis=1).astype(np.int64)
+        inter = (pa[rows] + pb - px) // 2
+        union = (pa[rows] + pb + px) // 2
+        scores = inter / np.maximum(union, 1)
+        best = int(scores.argmax())
+        best_score = float(scores[best])
+        if best_score >= min_score:
+            results.append((fp, row_tracks[int(rows[best])], best_score))
     return results
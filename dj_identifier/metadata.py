@@ -2,18 +2,29 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from pathlib import Path
 from typing import Dict, Iterable, List
 
+import numpy as np
+
 from .types import SegmentFingerprint, TrackMatch
 
 
 class FingerprintStore:
-    """Lightweight on-disk fingerprint database using JSON."""
+    """Lightweight on-disk fingerprint database.
+
+    Track metadata and hex signatures live in a JSON file; the packed
+    signature matrix is mirrored to a ``.npy`` sidecar that memory-maps on
+    load, so warm starts skip re-decoding every hex string.
+    """
 
     def __init__(self, path: str | Path):
         self.path = Path(path)
+        self.bits_path = self.path.with_suffix(".npy")
         self._data: Dict[str, Dict[str, str]] = {}
+        self._signatures: "SignatureIndex | None" = None
+        self._dirty = False
 
     @property
     def data(self) -> Dict[str, Dict[str, str]]:
@@ -30,30 +41,183 @@ class FingerprintStore:
     def save(self) -> None:
         with self.path.open("w", encoding="utf-8") as f:
             json.dump(self._data, f, indent=2, sort_keys=True)
+        # Row order must match the sorted JSON so the sidecar stays valid
+        # across a reload.
+        matrix = build_signature_matrix(dict(sorted(self._data.items()))).matrix
+        np.save(self.bits_path, matrix)
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        """True when in-memory entries differ from what was last saved/loaded."""
+
+        return self._dirty
 
     def add_track(self, track_id: str, title: str, artist: str, hashes: Iterable[str]) -> None:
-        self.data[track_id] = {
+        entry = {
             "title": title,
             "artist": artist,
             "hashes": list(hashes),
         }
+        if self.data.get(track_id) != entry:
+            self.data[track_id] = entry
+            self._signatures = None
+            self._dirty = True
+
+    def signature_matrix(self) -> "SignatureIndex":
+        """Stacked signature matrix, row-to-track mapping and exact index, built lazily."""
+
+        if self._signatures is None:
+            self._signatures = self._load_signatures()
+        return self._signatures
+
+    def _load_signatures(self) -> "SignatureIndex":
+        data = dict(sorted(self.data.items()))
+        if self.bits_path.exists() and self.path.exists():
+            if self.bits_path.stat().st_mtime_ns >= self.path.stat().st_mtime_ns:
+                matrix = np.load(self.bits_path, mmap_mode="r")
+                row_tracks = [
+                    track_id
+                    for track_id, entry in data.items()
+                    for _ in entry.get("hashes", [])
+                ]
+                if matrix.ndim == 2 and len(matrix) == len(row_tracks):
+                    return _index_from_matrix(matrix, row_tracks)
+        return build_signature_matrix(data)
 
     def resolve(self, track_id: str) -> Dict[str, str]:
         return self.data.get(track_id, {})
 
 
-from .fingerprinting import match_fingerprints
+class SqliteFingerprintStore:
+    """Fingerprint database backed by SQLite, for catalogs too large for JSON.
+
+    Tracks and signatures live in indexed tables and the database is opened
+    with mmap and WAL enabled, so startup touches no catalog data; metadata
+    lookups are single indexed SELECTs and the signature matrix is assembled
+    lazily on first match. Exposes the same interface as FingerprintStore.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        # check_same_thread=False: the store may be built on a worker thread
+        # (ensure_store overlaps with audio decoding) and queried from the
+        # caller's thread. Access is strictly sequential, with the Future
+        # result providing the happens-before edge, so this is safe.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA mmap_size=268435456;
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS tracks(
+                track_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fp(
+                hash TEXT NOT NULL,
+                track_id TEXT NOT NULL REFERENCES tracks(track_id)
+            );
+            CREATE INDEX IF NOT EXISTS ix_fp_hash ON fp(hash);
+            CREATE INDEX IF NOT EXISTS ix_fp_track ON fp(track_id);
+            """
+        )
+        self._signatures: "SignatureIndex | None" = None
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def data(self) -> Dict[str, Dict[str, str]]:
+        """Materialize the full catalog as a plain dict (export/debugging)."""
+
+        out: Dict[str, Dict[str, str]] = {}
+        for track_id, title, artist in self._conn.execute(
+            "SELECT track_id, title, artist FROM tracks"
+        ):
+            hashes = [
+                value
+                for (value,) in self._conn.execute(
+                    "SELECT hash FROM fp WHERE track_id = ? ORDER BY rowid", (track_id,)
+                )
+            ]
+            out[track_id] = {"title": title, "artist": artist, "hashes": hashes}
+        return out
+
+    def add_track(self, track_id: str, title: str, artist: str, hashes: Iterable[str]) -> None:
+        hashes = list(hashes)
+        current = self._conn.execute(
+            "SELECT title, artist FROM tracks WHERE track_id = ?", (track_id,)
+        ).fetchone()
+        current_hashes = [
+            value
+            for (value,) in self._conn.execute(
+                "SELECT hash FROM fp WHERE track_id = ? ORDER BY rowid", (track_id,)
+            )
+        ]
+        if current == (title, artist) and current_hashes == hashes:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?)", (track_id, title, artist)
+            )
+            self._conn.execute("DELETE FROM fp WHERE track_id = ?", (track_id,))
+            self._conn.executemany(
+                "INSERT INTO fp VALUES (?, ?)", [(value, track_id) for value in hashes]
+            )
+        self._signatures = None
+        self._dirty = True
+
+    def resolve(self, track_id: str) -> Dict[str, str]:
+        row = self._conn.execute(
+            "SELECT title, artist FROM tracks WHERE track_id = ?", (track_id,)
+        ).fetchone()
+        if row is None:
+            return {}
+        return {"title": row[0], "artist": row[1]}
+
+    def signature_matrix(self) -> "SignatureIndex":
+        if self._signatures is None:
+            rows = self._conn.execute(
+                "SELECT hash, track_id FROM fp ORDER BY track_id, rowid"
+            ).fetchall()
+            row_tracks = [track_id for _, track_id in rows]
+            matrix = (
+                np.vstack([hex_to_bits(value) for value, _ in rows])
+                if rows
+                else np.zeros((0, SIGNATURE_WORDS), dtype=np.uint64)
+            )
+            self._signatures = _index_from_matrix(matrix, row_tracks)
+        return self._signatures
+
+    def save(self) -> None:
+        self._conn.commit()
+        self._dirty = False
+
+
+from .fingerprinting import (
+    SIGNATURE_WORDS,
+    SignatureIndex,
+    _index_from_matrix,
+    build_signature_matrix,
+    hex_to_bits,
+    match_fingerprints,
+)
 
 
 def build_matches(
     fingerprints: Iterable[SegmentFingerprint],
-    store: FingerprintStore,
+    store: "FingerprintStore | SqliteFingerprintStore",
     min_score: float = 0.1,
 ) -> List[TrackMatch]:
     """Resolve fingerprint matches to full metadata records."""
 
     matches = []
-    for fp, track_id, score in match_fingerprints(list(fingerprints), store.data, min_score=min_score):
+    for fp, track_id, score in match_fingerprints(
+        list(fingerprints), min_score=min_score, signatures=store.signature_matrix()
+    ):
         meta = store.resolve(track_id)
         matches.append(
             TrackMatch(
@@ -3,12 +3,33 @@ from __future__ import annotations
 
 from typing import Iterable, List
 
+from pathlib import Path
+
 from .fingerprinting import FingerprintDB, fingerprint_segments
-from .metadata import FingerprintStore, build_matches
+from .metadata import FingerprintStore, SqliteFingerprintStore, build_matches
 from .segmentation import load_audio, onset_boundaries
 from .types import SegmentFingerprint, TrackMatch
 
 
+def run_pipeline_array(
+    y,
+    sr: int,
+    fingerprint_store: FingerprintStore,
+    max_segments: int | None = None,
+    min_segment_duration: float = 1.0,
+) -> List[TrackMatch]:
+    """
+    Produce timecoded matches for an already-decoded mono float32 signal.
+
+    Entry point for callers that decode audio themselves (e.g. straight from
+    an ffmpeg pipe), skipping the file load step entirely.
+    """
+
+    segments = onset_boundaries(y, sr, max_segments=max_segments, min_duration=min_segment_duration)
+    fingerprints: Iterable[SegmentFingerprint] = fingerprint_segments(y, sr, segments)
+    return build_matches(fingerprints, fingerprint_store)
+
+
 def run_pipeline(
     audio_path: str,
     fingerprint_store: FingerprintStore,
@@ -24,16 +45,29 @@ def run_pipeline(
     """
 
     y, sr = load_audio(audio_path, sr=target_sr)
-    segments = onset_boundaries(y, sr, max_segments=max_segments, min_duration=min_segment_duration)
-    segments = onset_boundaries(y, sr, max_segments=max_segments)
-    fingerprints: Iterable[SegmentFingerprint] = fingerprint_segments(y, sr, segments)
-    return build_matches(fingerprints, fingerprint_store)
+    return run_pipeline_array(
+        y,
+        sr,
+        fingerprint_store,
+        max_segments=max_segments,
+        min_segment_duration=min_segment_duration,
+    )
 
 
-def bootstrap_store(samples: FingerprintDB, path: str | None = None) -> FingerprintStore:
-    """Create a FingerprintStore preloaded with sample hashes."""
+def bootstrap_store(
+    samples: FingerprintDB, path: str | None = None
+) -> FingerprintStore | SqliteFingerprintStore:
+    """Create a fingerprint store preloaded with sample hashes.
+
+    A ``.sqlite``/``.db`` path selects the SQLite backend; anything else
+    uses the JSON store.
+    """
 
-    store = FingerprintStore(path or "fingerprints.json")
+    store_path = Path(path or "fingerprints.json")
+    if store_path.suffix in {".sqlite", ".db"}:
+        store: FingerprintStore | SqliteFingerprintStore = SqliteFingerprintStore(store_path)
+    else:
+        store = FingerprintStore(store_path)
     for track_id, record in samples.items():
         store.add_track(
             track_id=track_id,
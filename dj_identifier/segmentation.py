@@ -5,7 +5,20 @@ from typing import Iterable, List
 
 import numpy as np
 
-from .types import TrackSegment, samples_to_seconds
+from .types import SegmentBatch, TrackSegment, samples_to_seconds
+
+_librosa = None
+
+
+def _get_librosa():
+    """Resolve librosa once per process, keeping its import cost off cold start."""
+
+    global _librosa
+    if _librosa is None:
+        import librosa
+
+        _librosa = librosa
+    return _librosa
 
 
 def onset_boundaries(
@@ -23,8 +36,7 @@ def onset_boundaries(
     duration and deduplicated.
     """
 
-    import librosa
-
+    librosa = _get_librosa()
     onset_frames = librosa.onset.onset_detect(
         y=y,
         sr=sr,
@@ -56,29 +68,42 @@ def onset_boundaries(
             segments.append(TrackSegment(start=current_start, end=end))
 
         current_start = end
-    for start, end in zip(times[:-1], times[1:]):
-        if end - start <= 0:
-            continue
-        segments.append(TrackSegment(start=start, end=end))
 
     return segments
 
 
 def load_audio(path: str, sr: int = 22050) -> tuple[np.ndarray, int]:
-    """Load audio as mono float32 using librosa."""
+    """Load audio as mono float32.
+
+    Decodes with soundfile straight into float32 and resamples with a
+    polyphase filter, avoiding librosa.load's float64 intermediates and
+    slower kaiser_best resampler. Containers libsndfile cannot decode fall
+    back to librosa/audioread.
+    """
+
+    import soundfile as sf
+
+    try:
+        data, src_sr = sf.read(path, dtype="float32", always_2d=False)
+    except RuntimeError:
+        librosa = _get_librosa()
+        y, sr = librosa.load(path, sr=sr, mono=True)
+        return y, sr
+
+    if data.ndim == 2:
+        data = data.mean(axis=1, dtype=np.float32)
+    if src_sr != sr:
+        from math import gcd
 
-    import librosa
+        from scipy.signal import resample_poly
 
-    y, sr = librosa.load(path, sr=sr, mono=True)
-    return y, sr
+        g = gcd(sr, src_sr)
+        data = resample_poly(data, sr // g, src_sr // g).astype(np.float32)
+    return data, sr
 
 
 def slice_audio(y: np.ndarray, sr: int, segments: Iterable[TrackSegment]) -> List[np.ndarray]:
     """Yield audio slices matching the provided segments."""
 
-    slices: List[np.ndarray] = []
-    for segment in segments:
-        start = int(segment.start * sr)
-        end = int(segment.end * sr)
-        slices.append(y[start:end])
-    return slices
+    starts, ends = SegmentBatch.from_segments(list(segments)).sample_bounds(sr)
+    return [y[lo:hi] for lo, hi in zip(starts, ends)]
@@ -4,6 +4,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Sequence
 
+import numpy as np
+
 
 @dataclass
 class TrackSegment:
@@ -18,10 +20,40 @@ class TrackSegment:
 
 @dataclass
 class SegmentFingerprint:
-    """Fingerprint data for a track segment."""
+    """Fingerprint data for a track segment.
+
+    ``bits`` is a packed 256-bit signature stored as a ``uint64`` array.
+    """
 
     segment: TrackSegment
-    hash: str
+    bits: np.ndarray
+
+
+@dataclass
+class SegmentBatch:
+    """Structure-of-arrays view of segment boundaries for vectorized indexing."""
+
+    starts: np.ndarray
+    ends: np.ndarray
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[TrackSegment]) -> "SegmentBatch":
+        count = len(segments)
+        return cls(
+            starts=np.fromiter((s.start for s in segments), dtype=np.float64, count=count),
+            ends=np.fromiter((s.end for s in segments), dtype=np.float64, count=count),
+        )
+
+    def sample_bounds(self, sr: int) -> tuple[np.ndarray, np.ndarray]:
+        """Start/end sample indices for every segment in two array ops."""
+
+        return (self.starts * sr).astype(np.int64), (self.ends * sr).astype(np.int64)
+
+    def to_list(self) -> List[TrackSegment]:
+        return [
+            TrackSegment(start=float(s), end=float(e))
+            for s, e in zip(self.starts, self.ends)
+        ]
 
 
 @dataclass
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import importlib.util
 import json
 import os
@@ -8,9 +9,22 @@ import shlex
 import shutil
 import subprocess
 import sys
-import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from dj_identifier.types import TrackMatch
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; json handles these small files fine
+    orjson = None
 
 FFMPEG_ENV_VAR = "FFMPEG_PATH"
 
@@ -36,10 +50,7 @@ def _ensure_dependencies() -> None:
         "librosa",
         "soundfile",
     ]
-    missing: list[str] = []
-    for module in required:
-        if importlib.util.find_spec(module) is None:
-            missing.append(f"- {module}")
+    missing = [f"- {module}" for module in required if importlib.util.find_spec(module) is None]
 
     if missing:
         message = "\n".join(
@@ -53,11 +64,12 @@ def _ensure_dependencies() -> None:
         raise SystemExit(message)
 
 
-_ensure_dependencies()
-
-
+@functools.cache
 def _resolve_ffmpeg() -> str:
-    """Return an ffmpeg executable path or exit with a helpful hint."""
+    """Return an ffmpeg executable path or exit with a helpful hint.
+
+    Cached: the PATH lookups and existence stats only run once per process.
+    """
 
     candidates: list[str] = []
     seen: set[str] = set()
@@ -104,83 +116,154 @@ def _resolve_ffmpeg() -> str:
     )
     raise SystemExit(hint)
 
-from dj_identifier.pipeline import bootstrap_store, run_pipeline
-from dj_identifier.types import TrackMatch
-
 DEFAULT_FINGERPRINT_DB = REPO_ROOT / "fingerprints.json"
 DEFAULT_BOOTSTRAP = REPO_ROOT / "examples" / "fingerprints.json"
 SUPPORTED_VIDEO_EXTS = {".mp4", ".mkv"}
+# Sample rate the fingerprinting pipeline consumes; ffmpeg resamples to this
+# in its single decode pass so no Python-side resampling is ever needed.
+TARGET_SR = 22050
+# 1 MB pipe buffer: amortizes syscall cost on the raw PCM stream.
+_PIPE_BUFSIZE = 1 << 20
+# Last stderr lines kept for error reporting.
+_STDERR_TAIL_LINES = 256
+
+
+def _drain_lines(stream, tail: deque) -> None:
+    for line in stream:
+        tail.append(line)
+
+
+@lru_cache(maxsize=8)
+def _load_bootstrap_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Dict[str, str]]:
+    raw = Path(path_str).read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def load_bootstrap(path: Path) -> Dict[str, Dict[str, str]]:
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
         return {}
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    # The cache key includes mtime and size, so an edited file reparses while
+    # repeated loads of an unchanged file cost one stat.
+    return _load_bootstrap_cached(str(path), stat.st_mtime_ns, stat.st_size)
 
 
 def ensure_store(db_path: Path = DEFAULT_FINGERPRINT_DB, bootstrap_path: Path = DEFAULT_BOOTSTRAP):
     """Charge ou initialise la base d'empreintes."""
 
+    from dj_identifier.pipeline import bootstrap_store
+
     bootstrap_data = load_bootstrap(bootstrap_path)
     store = bootstrap_store(bootstrap_data, path=db_path)
-    store.save()
+    if store.dirty:
+        store.save()
     return store
 
 
-def extract_audio(video_path: Path, workdir: Path, ffmpeg_path: str) -> Path:
-    """Utilise ffmpeg pour extraire l'audio mono du conteneur vidéo."""
+def extract_audio(video_path: Path, ffmpeg_path: str, sr: int = TARGET_SR) -> np.ndarray:
+    """Décode l'audio mono en mémoire via ffmpeg (PCM float32 sur stdout).
+
+    Une seule passe ffmpeg : décodage, normalisation de niveau puis
+    rééchantillonnage soxr vers le taux natif du pipeline, sans WAV
+    temporaire ni rééchantillonnage côté Python. Le rééchantillonnage vient
+    après loudnorm (qui travaille en interne à 192 kHz) avec un taux
+    explicite, pour que la descente vers ``sr`` passe bien par soxr et non
+    par le convertisseur swresample inséré par défaut en sortie.
+    """
+
+    import numpy as np
 
-    output = workdir / f"{video_path.stem}.wav"
     command = [
         ffmpeg_path,
-        "-y",
+        "-loglevel",
+        "error",
+        "-nostats",
         "-i",
         str(video_path),
         "-vn",
-        "-acodec",
-        "pcm_s16le",
-        "-ar",
-        "44100",
+        "-af",
+        f"loudnorm=I=-16:TP=-1.5,aresample={sr}:resampler=soxr:precision=28",
         "-ac",
         "1",
-        str(output),
+        "-f",
+        "f32le",
+        "pipe:1",
     ]
-    subprocess.run(
+    proc = subprocess.Popen(
         command,
-        check=True,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
+        bufsize=_PIPE_BUFSIZE,
     )
-    return output
+    # Drain stderr concurrently into a bounded ring buffer: we keep a tail
+    # for error reporting without buffering unbounded chatter or risking a
+    # pipe deadlock while stdout is being read.
+    tail: deque[bytes] = deque(maxlen=_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=_drain_lines, args=(proc.stderr, tail), daemon=True)
+    drain.start()
+
+    raw = bytearray()
+    while True:
+        block = proc.stdout.read(_PIPE_BUFSIZE)
+        if not block:
+            break
+        raw += block
+    proc.wait()
+    drain.join()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, command, stderr=b"".join(tail)
+        )
+    return np.frombuffer(raw, dtype=np.float32)
 
 
 def format_time(seconds: float) -> str:
-    minutes = int(seconds // 60)
-    secs = int(seconds % 60)
-    return f"{minutes:02d}:{secs:02d}"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+# Below this many matches, per-row float formatting is cheaper than the
+# NumPy round trip.
+_BATCH_FORMAT_THRESHOLD = 256
 
 
 def render_matches(matches: Iterable[TrackMatch]) -> str:
-    lines: List[str] = []
-    for match in matches:
-        start = format_time(match.segment.start)
-        end = format_time(match.segment.end)
-        lines.append(
-            f"[{start} - {end}] {match.artist} - {match.title} (confiance {match.confidence:.2f})"
+    matches = matches if isinstance(matches, list) else list(matches)
+    if len(matches) > _BATCH_FORMAT_THRESHOLD:
+        import numpy as np
+
+        confidences = np.fromiter(
+            (match.confidence for match in matches), dtype=np.float32, count=len(matches)
         )
-    if not lines:
-        return "Aucun titre détecté."
-    return "\n".join(lines)
+        conf_strs = np.char.mod("%.2f", confidences)
+        parts = [
+            f"[{format_time(match.segment.start)} - {format_time(match.segment.end)}] "
+            f"{match.artist} - {match.title} (confiance {conf})"
+            for match, conf in zip(matches, conf_strs)
+        ]
+    else:
+        parts = [
+            f"[{format_time(match.segment.start)} - {format_time(match.segment.end)}] "
+            f"{match.artist} - {match.title} (confiance {match.confidence:.2f})"
+            for match in matches
+        ]
+    return "\n".join(parts) if parts else "Aucun titre détecté."
 
 
 def validate_video_path(path_str: str) -> Path:
-    path = Path(path_str).expanduser().resolve()
-    if not path.exists():
-        raise FileNotFoundError(f"Fichier introuvable: {path}")
-    if path.suffix.lower() not in SUPPORTED_VIDEO_EXTS:
+    # One stat call and a string suffix check; no resolve(), which walks
+    # symlinks and is costly on network filesystems (ffmpeg accepts
+    # relative paths fine).
+    expanded = os.path.expanduser(path_str)
+    try:
+        os.stat(expanded)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Fichier introuvable: {expanded}") from None
+    if not expanded.lower().endswith(tuple(SUPPORTED_VIDEO_EXTS)):
         raise ValueError("Merci de fournir un .mp4 ou .mkv")
-    return path
+    return Path(expanded)
 
 
 def parse_args() -> argparse.Namespace:
@@ -215,27 +298,37 @@ def main() -> int:
         print(exc)
         return 1
 
+    _ensure_dependencies()
+
     try:
         ffmpeg_path = _resolve_ffmpeg()
     except SystemExit as exc:
         print(exc)
         return 1
 
-    store = ensure_store()
-
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            audio_path = extract_audio(video_path, Path(tmpdir), ffmpeg_path)
-            matches = run_pipeline(
-                str(audio_path),
-                store,
-                max_segments=args.max_segments,
-                min_segment_duration=args.min_segment_duration,
-            )
-    except subprocess.CalledProcessError as exc:
-        print("Extraction audio échouée (ffmpeg)")
-        print(exc.stderr.decode("utf-8", errors="ignore"))
-        return 1
+    from dj_identifier.pipeline import run_pipeline_array
+
+    # La lecture de la base d'empreintes et le décodage ffmpeg sont
+    # indépendants : on les fait se recouvrir pour sortir ensure_store du
+    # chemin critique.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        store_future = executor.submit(ensure_store)
+        try:
+            samples = extract_audio(video_path, ffmpeg_path)
+        except subprocess.CalledProcessError as exc:
+            print("Extraction audio échouée (ffmpeg)")
+            if exc.stderr:
+                print(exc.stderr.decode("utf-8", errors="ignore"))
+            return 1
+        store = store_future.result()
+
+    matches = run_pipeline_array(
+        samples,
+        TARGET_SR,
+        store,
+        max_segments=args.max_segments,
+        min_segment_duration=args.min_segment_duration,
+    )
 
     print(render_matches(matches))
     return 0